@@ -3,24 +3,166 @@ import asyncio
 import random
 import re
 import logging
+import logging.handlers
+import queue
+import threading
+import atexit
 import sys
 import gc
 import time
 import psutil
 import io
 import json
+from bisect import bisect_left, bisect_right
+import hmac
+import cProfile
+import pstats
 from enum import Enum
 from typing import List, Tuple, Optional, Dict
 from pyrogram import Client, filters, idle
+from pyrogram.types import InputMediaDocument
 from pyrogram.errors import FloodWait, RPCError, PeerIdInvalid, ChannelInvalid, ChannelPrivate, MessageNotModified
 from aiohttp import web
 
 # --- LOGGING SYSTEM ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# Event loop hanya menaruh record ke queue; penulisan stdout/file dikerjakan thread QueueListener.
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").strip().lower()  # json / text
+LOG_FILE = os.environ.get("LOG_FILE", "")  # kosong = tanpa file sink
+try:
+    LOG_DEDUP_WINDOW = float(os.environ.get("LOG_DEDUP_WINDOW", 60))
+    LOG_FILE_MAX_MB = int(os.environ.get("LOG_FILE_MAX_MB", 10))
+    LOG_FILE_BACKUPS = int(os.environ.get("LOG_FILE_BACKUPS", 3))
+except ValueError as e:
+    # Logger belum siap di titik ini, jadi tulis langsung ke stderr
+    print(f"❌ Config Error: {e}", file=sys.stderr)
+    sys.exit(1)
+
+LOG_FIELDS = ('bot_id', 'job', 'dst', 'msg_id', 'latency', 'error', 'suppressed')
+
+class StructuredFormatter(logging.Formatter):
+    def __init__(self, as_json: bool):
+        super().__init__("%(asctime)s - %(levelname)s - %(message)s")
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {f: getattr(record, f) for f in LOG_FIELDS if getattr(record, f, None) is not None}
+        if not self.as_json:
+            line = super().format(record)
+            if fields:
+                line += " [" + " ".join(f"{k}={v}" for k, v in fields.items()) + "]"
+            return line
+        data = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            **fields
+        }
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class DuplicateFilter(logging.Filter):
+    # Warning/error (dan record ber-field 'error', mis. FloodWait di level INFO) yang berulang hanya
+    # lolos sekali per window; sisanya dihitung dan dilaporkan lewat flush() saat window habis.
+    MAX_KEYS = 1000
+
+    def __init__(self, window: float):
+        super().__init__()
+        self.window = window
+        # key -> [waktu lolos, jumlah disembunyikan, ringkasan record]. Hanya field ringan yang
+        # disimpan (bukan LogRecord) supaya exc_info/args tidak menahan frame worker.
+        self.seen: Dict[Tuple, List] = {}
+        self.pending: List[Tuple[Dict, int]] = []  # entry yang di-evict tapi hitungannya belum dilaporkan
+        self.lock = threading.Lock()
+
+    def make_key(self, record: logging.LogRecord) -> Optional[Tuple]:
+        error = getattr(record, 'error', None)
+        if error:
+            return (record.name, record.levelno, error, getattr(record, 'dst', None))
+        if record.levelno >= logging.WARNING:
+            return (record.name, record.levelno, record.getMessage())
+        return None
+
+    def evict_expired(self, now: float):
+        for key, (passed_at, count, info) in list(self.seen.items()):
+            if now - passed_at >= self.window:
+                del self.seen[key]
+                if count:
+                    self.pending.append((info, count))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.window <= 0 or getattr(record, 'dedup_summary', False):
+            return True
+        key = self.make_key(record)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry and now - entry[0] < self.window:
+                entry[1] += 1
+                return False
+            if entry and entry[1]:
+                record.suppressed = entry[1]
+            if key not in self.seen and len(self.seen) >= self.MAX_KEYS:
+                self.evict_expired(now)
+                if len(self.seen) >= self.MAX_KEYS:
+                    return True  # Penuh oleh window yang masih aktif: loloskan tanpa dilacak
+            info = {
+                'name': record.name,
+                'levelno': record.levelno,
+                'levelname': record.levelname,
+                'msg': record.getMessage(),
+                **{f: getattr(record, f) for f in LOG_FIELDS if getattr(record, f, None) is not None}
+            }
+            info.pop('suppressed', None)
+            self.seen[key] = [now, 0, info]
+        return True
+
+    def flush(self) -> List[logging.LogRecord]:
+        # Ambil ringkasan untuk window yang sudah habis supaya hitungan akhir badai tidak hilang
+        created = time.time()
+        with self.lock:
+            self.evict_expired(time.monotonic())
+            pending, self.pending = self.pending, []
+        return [
+            logging.makeLogRecord({
+                **info,
+                'created': created,
+                'msecs': (created - int(created)) * 1000,
+                'suppressed': count,
+                'dedup_summary': True
+            })
+            for info, count in pending
+        ]
+
+class BotContextFilter(logging.Filter):
+    def __init__(self, bot_id: int):
+        super().__init__()
+        self.bot_id = bot_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.bot_id = self.bot_id
+        return True
+
+log_formatter = StructuredFormatter(as_json=LOG_FORMAT == "json")
+log_sinks: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+if LOG_FILE:
+    log_sinks.append(logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_FILE_MAX_MB * 1024 * 1024, backupCount=LOG_FILE_BACKUPS, encoding="utf-8"
+    ))
+for sink in log_sinks:
+    sink.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))  # format final di sink
+dedup_filter = DuplicateFilter(LOG_DEDUP_WINDOW)
+queue_handler.addFilter(dedup_filter)
+log_listener = logging.handlers.QueueListener(log_queue, *log_sinks, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 logging.getLogger("pyrogram").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
@@ -42,6 +184,54 @@ DEFAULT_BATCH_SIZE = 10000
 DEFAULT_BATCH_TIME = 60
 DEFAULT_CHUNK_SIZE = 50
 DEFAULT_SPEED = 0.1
+TELEGRAM_TEXT_LIMIT = 4096
+
+# --- KONFIGURASI DIAGNOSTIK ---
+# DEBUG_TOKEN kosong = route /debug/* tidak didaftarkan sama sekali.
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN", "")
+USE_UVLOOP = os.environ.get("USE_UVLOOP", "off").strip().lower() == "on"
+try:
+    LOOP_LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", 1.0))
+    SLOW_CALLBACK_MS = float(os.environ.get("SLOW_CALLBACK_MS", 0))  # 0 = off
+    MAX_PROFILE_SECONDS = int(os.environ.get("MAX_PROFILE_SECONDS", 120))
+    if LOOP_LAG_INTERVAL <= 0:
+        raise ValueError("LOOP_LAG_INTERVAL harus lebih besar dari 0")
+except ValueError as e:
+    logger.error(f"❌ Config Error: {e}")
+    sys.exit(1)
+
+if USE_UVLOOP:
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("uvloop aktif")
+    except ImportError:
+        logger.warning("USE_UVLOOP=on tapi uvloop tidak terinstall, pakai asyncio default")
+
+loop_stats = {'lag_ms': 0.0, 'max_lag_ms': 0.0, 'window_max_ms': 0.0, 'samples': 0}
+
+# --- KONFIGURASI GOVERNOR (auto_batch: on) ---
+try:
+    GOVERNOR_INTERVAL = float(os.environ.get("GOVERNOR_INTERVAL", 5))
+    GOVERNOR_CPU_HIGH = float(os.environ.get("GOVERNOR_CPU_HIGH", 80))
+    GOVERNOR_CPU_LOW = float(os.environ.get("GOVERNOR_CPU_LOW", 50))
+    GOVERNOR_RSS_LIMIT_MB = float(os.environ.get("GOVERNOR_RSS_LIMIT_MB", 400))  # Hanya menahan kenaikan level
+    GOVERNOR_LAG_HIGH_MS = float(os.environ.get("GOVERNOR_LAG_HIGH_MS", 250))
+    GOVERNOR_LAG_LOW_MS = float(os.environ.get("GOVERNOR_LAG_LOW_MS", 50))
+    GOVERNOR_MIN_LEVEL = float(os.environ.get("GOVERNOR_MIN_LEVEL", 0.2))
+    if GOVERNOR_INTERVAL <= 0:
+        raise ValueError("GOVERNOR_INTERVAL harus lebih besar dari 0")
+    if not 0 < GOVERNOR_MIN_LEVEL <= 1:
+        raise ValueError("GOVERNOR_MIN_LEVEL harus di antara 0 (eksklusif) dan 1")
+    for name, low, high in (
+        ("CPU", GOVERNOR_CPU_LOW, GOVERNOR_CPU_HIGH),
+        ("LAG_MS", GOVERNOR_LAG_LOW_MS, GOVERNOR_LAG_HIGH_MS),
+    ):
+        if low >= high:
+            raise ValueError(f"GOVERNOR_{name} LOW ({low}) harus lebih kecil dari HIGH ({high})")
+except ValueError as e:
+    logger.error(f"❌ Config Error: {e}")
+    sys.exit(1)
 
 class FilterType(Enum):
     ALL = 'all'
@@ -65,10 +255,13 @@ def format_time(seconds: float) -> str:
         return f"{hours} jam {minutes} menit"
 
 # --- 2. LOGIKA TRAFFIC LIGHT ---
+system_proc = psutil.Process(os.getpid())
+
 def get_system_status(delay_avg: float = 0) -> Tuple[float, str, float, str]:
     try:
-        proc = psutil.Process(os.getpid())
-        cpu = proc.cpu_percent(interval=0.1)
+        proc = system_proc
+        # interval=None: tidak memblokir loop (dulu 0.1s tiap refresh dashboard ikut jadi lag)
+        cpu = proc.cpu_percent(interval=None)
         if cpu <= 10:
             cpu_stat = "🟢 Santai"
         elif cpu <= 50:
@@ -102,6 +295,149 @@ def make_bar(current: int, total: int, length: int = 10) -> str:
     bar = "🟧" * filled + "⬜" * (length - filled)
     return f"{bar} **{int(pct * 100)}%**"
 
+# --- 2b. RANGE SET (PROGRESS PER TUJUAN) ---
+class RangeSet:
+    """Himpunan ID pesan yang disimpan sebagai interval tertutup [start, end] yang otomatis di-merge.
+
+    Pencarian posisi O(log n) via bisect; ID berurutan cukup memperpanjang interval terakhir,
+    jadi jutaan ID yang rapat hanya butuh beberapa interval.
+    """
+    __slots__ = ('starts', 'ends', 'count')
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.count = 0
+
+    def add(self, msg_id: int):
+        self.add_range(msg_id, msg_id)
+
+    def add_range(self, lo: int, hi: int):
+        if lo > hi:
+            return
+        # Interval yang overlap atau bersebelahan dengan [lo, hi] ada di indeks i..j-1
+        i = bisect_left(self.ends, lo - 1)
+        j = bisect_right(self.starts, hi + 1)
+        removed = 0
+        if i < j:
+            lo = min(lo, self.starts[i])
+            hi = max(hi, self.ends[j - 1])
+            removed = sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+        self.starts[i:j] = [lo]
+        self.ends[i:j] = [hi]
+        self.count += (hi - lo + 1) - removed
+
+    def __contains__(self, msg_id: int) -> bool:
+        i = bisect_right(self.starts, msg_id) - 1
+        return i >= 0 and self.ends[i] >= msg_id
+
+    def covers(self, lo: int, hi: int) -> bool:
+        i = bisect_right(self.starts, lo) - 1
+        return i >= 0 and self.ends[i] >= hi
+
+    def __len__(self) -> int:
+        return self.count
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
+
+    def dumps(self) -> str:
+        # Format ringkas: "1-500,502,510-900"
+        return ",".join(str(s) if s == e else f"{s}-{e}" for s, e in self.ranges())
+
+    @classmethod
+    def loads(cls, text: str) -> "RangeSet":
+        rs = cls()
+        if text.strip() == "-":  # Set kosong
+            return rs
+        for part in filter(None, (p.strip() for p in text.split(","))):
+            lo, sep, hi = part.partition("-")
+            if sep and not hi:
+                raise ValueError(f"range tidak valid '{part}'")
+            hi = hi or lo
+            if not lo.isdigit() or not hi.isdigit() or int(lo) <= 0 or int(lo) > int(hi):
+                raise ValueError(f"range tidak valid '{part}'")
+            rs.add_range(int(lo), int(hi))
+        return rs
+
+# --- 2c. GOVERNOR BEBAN SERVER (DIPAKAI SEMUA BOT) ---
+class LoadGovernor:
+    """Satu pengatur beban untuk seluruh proses.
+
+    Memantau CPU, RSS dan lag event loop (dihaluskan dengan EMA), lalu menaikkan/menurunkan
+    `level` (MIN_LEVEL..1.0) dengan hysteresis: turun multiplikatif kalau CPU atau lag di atas
+    batas HIGH, naik pelan kalau keduanya di bawah batas LOW, diam di antaranya. RSS di atas
+    RSS_LIMIT hanya menahan kenaikan, dan hanya selama masih bertambah: memperlambat kerja tidak
+    mengembalikan memori ke OS, jadi RSS tinggi yang sudah datar tidak boleh mengunci level.
+    Worker membaca level untuk menskala jumlah copy paralel dan lama istirahat.
+    """
+    EMA_ALPHA = 0.3
+    STEP_DOWN = 0.75
+    STEP_UP = 0.05
+
+    def __init__(self):
+        self.level = 1.0
+        self.cpu = 0.0
+        self.rss_mb = 0.0
+        self.lag_ms = 0.0
+        self.rss_rising = False
+        self.state = "🟢 Normal"
+
+    def sample(self, proc: psutil.Process):
+        a = self.EMA_ALPHA
+        # interval=None: tidak memblokir loop, dihitung sejak panggilan sebelumnya
+        self.cpu = a * proc.cpu_percent(interval=None) + (1 - a) * self.cpu
+        rss_now = proc.memory_info().rss / (1024 * 1024)
+        self.rss_rising = rss_now > self.rss_mb + 1  # di atas EMA = working set masih bertambah
+        self.rss_mb = a * rss_now + (1 - a) * self.rss_mb
+        # Lag terburuk sejak sample governor sebelumnya, bukan cuma sample terakhir
+        window_lag, loop_stats['window_max_ms'] = loop_stats['window_max_ms'], 0.0
+        self.lag_ms = a * window_lag + (1 - a) * self.lag_ms
+
+    def adjust(self):
+        overloaded = self.cpu > GOVERNOR_CPU_HIGH or self.lag_ms > GOVERNOR_LAG_HIGH_MS
+        relaxed = (
+            self.cpu < GOVERNOR_CPU_LOW
+            and not (self.rss_mb > GOVERNOR_RSS_LIMIT_MB and self.rss_rising)
+            and self.lag_ms < GOVERNOR_LAG_LOW_MS
+        )
+        if overloaded:
+            self.level = max(GOVERNOR_MIN_LEVEL, self.level * self.STEP_DOWN)
+            state = "🔴 Rem"
+        elif relaxed:
+            self.level = min(1.0, self.level + self.STEP_UP)
+            state = "🟢 Normal" if self.level >= 1.0 else "🟡 Pulih"
+        else:
+            state = "🟡 Tahan"
+        if state != self.state:
+            logger.info(
+                f"🎛️ Governor {state}: level {self.level:.2f} | CPU {self.cpu:.0f}% | "
+                f"RAM {self.rss_mb:.0f} MB | Lag {self.lag_ms:.0f} ms"
+            )
+            self.state = state
+
+    async def run(self):
+        proc = psutil.Process(os.getpid())
+        proc.cpu_percent(interval=None)  # Priming, sample pertama selalu 0
+        while True:
+            await asyncio.sleep(GOVERNOR_INTERVAL)
+            try:
+                self.sample(proc)
+                self.adjust()
+            except Exception as e:
+                logger.warning(f"Governor sample failed: {e}")
+
+    def concurrency(self, num_tasks: int) -> int:
+        return max(1, round(num_tasks * self.level))
+
+    def scale_rest(self, seconds: float) -> float:
+        return seconds / self.level
+
+    def summary(self) -> str:
+        return f"{self.state} | Level {self.level:.2f} | CPU {self.cpu:.0f}% | RAM {self.rss_mb:.0f} MB | Lag {self.lag_ms:.0f} ms"
+
+governor = LoadGovernor()
+
 # --- 3. PARSE LINK ---
 def parse_link(link: Optional[str]) -> Tuple[Optional[any], Optional[int]]:
     if not link:
@@ -160,6 +496,10 @@ def parse_config(text: str) -> Dict:
     filter_tujuan_matches = re.findall(r"filter_tujuan(\d+):\s*(\w+)", text, re.IGNORECASE)
     config['filter_tujuan'] = {int(num): val.lower() for num, val in filter_tujuan_matches}
     
+    # Parse resume done_tujuanN (format RangeSet dari checkpoint / file resume), sampai akhir baris atau '#'
+    done_tujuan_matches = re.findall(r"done_tujuan(\d+):[ \t]*([^#\n]*)", text, re.IGNORECASE)
+    config['done_tujuan'] = {int(num): val.strip() for num, val in done_tujuan_matches}
+    
     return config
 
 # --- 5. VALIDATE CONFIG ---
@@ -210,8 +550,86 @@ def validate_config(config: Dict) -> Tuple[bool, str]:
     except ValueError as e:
         return False, f"Invalid filter type: {e}. Pilihan: all, video, foto, dokumen, audio, allout"
     
+    # Resume ranges divalidasi terpisah supaya pesan error-nya tidak tertukar dengan filter
+    config['dst_done'] = []
+    for i in range(len(config['dst_links'])):
+        done_str = config['done_tujuan'].get(i+1, "")
+        if "…" in done_str:
+            return False, f"done_tujuan{i+1} terpotong. Balas file resume_bot_N.txt dengan perintah start untuk resume."
+        try:
+            config['dst_done'].append(RangeSet.loads(done_str))
+        except ValueError as e:
+            return False, f"Format done_tujuan{i+1} salah: {e}. Contoh: 100-250,260,300-400"
+    
     return True, ""
 
+def clip_ranges(rs: RangeSet, start_id: int, end_id: int) -> RangeSet:
+    clipped = RangeSet()
+    for lo, hi in rs.ranges():
+        clipped.add_range(max(lo, start_id), min(hi, end_id))
+    return clipped
+
+def mark_ids(dst: Dict, kind: str, lo: int, hi: Optional[int] = None):
+    # Catat ke done/failed/skipped sekaligus ke 'handled' (union ketiganya di range job),
+    # supaya sisa pekerjaan bisa dihitung O(1) tanpa menggabung ulang set tiap checkpoint
+    hi = lo if hi is None else hi
+    dst[kind].add_range(lo, hi)
+    dst['handled'].add_range(lo, hi)
+
+def remaining_ids(dst: Dict, start_id: int, end_id: int) -> int:
+    return max(0, (end_id - start_id + 1) - len(dst['handled']))
+
+def ranges_budget(num_dst: int) -> int:
+    # Jatah karakter encoding done per tujuan agar checkpoint muat di satu pesan Telegram
+    return max(0, (TELEGRAM_TEXT_LIMIT - 300) // num_dst - 250)
+
+def done_encoding(rs: RangeSet, budget: int) -> Optional[str]:
+    # None kalau encoding tidak muat budget. Tiap range minimal "digit start" + koma,
+    # jadi set yang jelas kebesaran tidak perlu di-dumps().
+    if rs.starts and len(rs.starts) * (len(str(rs.starts[0])) + 1) - 1 > budget:
+        return None
+    text = rs.dumps()
+    return text if len(text) <= budget else None
+
+def format_dst_ranges(dst: Dict, idx: int, budget: int, bot_id: int) -> str:
+    # Baris done_tujuanN hanya ditulis utuh (bisa langsung ditempel ke /start untuk resume)
+    text = ""
+    if dst['done']:
+        done_text = done_encoding(dst['done'], budget)
+        if done_text is not None:
+            text += f"   ✔️ done_tujuan{idx+1}: {done_text}\n"
+        else:
+            text += (
+                f"   ✔️ Done {len(dst['done'])} ID ({len(dst['done'].starts)} range), "
+                f"data resume di file resume_bot_{bot_id}.txt\n"
+            )
+    if dst['failed']:
+        text += f"   ❗ Gagal: {len(dst['failed'])} ID ({len(dst['failed'].starts)} range)\n"
+    if dst['skipped']:
+        text += f"   ⏭️ Skip: {len(dst['skipped'])} ID\n"
+    return text
+
+def build_resume_file(dst_list: List[Dict], bot_id: int) -> io.BytesIO:
+    lines = [f"done_tujuan{idx+1}: {dst['done'].dumps()}" for idx, dst in enumerate(dst_list) if dst['done']]
+    resume_file = io.BytesIO("\n".join(lines).encode())
+    resume_file.name = f"resume_bot_{bot_id}.txt"
+    return resume_file
+
+async def save_resume_file(app: Client, group_chat_id, dst_list: List[Dict], bot_id: int, resume_msg):
+    # Satu dokumen per job yang di-replace isinya, supaya grup tidak dibanjiri file tiap checkpoint
+    caption = f"💾 Resume Bot {bot_id}: balas file ini dengan perintah start (config lengkap) untuk melanjutkan"
+    resume_file = build_resume_file(dst_list, bot_id)
+    if resume_msg is None:
+        return await app.send_document(group_chat_id, resume_file, caption=caption)
+    await resume_msg.edit_media(InputMediaDocument(resume_file, caption=caption))
+    return resume_msg
+
+def fit_text(text: str, limit: int = TELEGRAM_TEXT_LIMIT - 100) -> str:
+    # Potong per baris supaya tidak ada baris done_tujuanN setengah jadi
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit("\n", 1)[0] + "\n… (terpotong)\n"
+
 # --- 6. WORKER UTAMA (SMART CHUNKING / EMBER) ---
 async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: Client, bot_logger, group_chat_id):
     bot_data[bot_id]['is_working'] = True
@@ -241,6 +659,7 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
     auto_batch = job['auto_batch']
     export_stats_flag = job['export_stats']
     anti_modify = job['anti_modify']
+    log_ctx = {'job': job['job_id']}
     
     flood_count = 0
     last_progress_time = time.time()
@@ -256,6 +675,8 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
     last_checkpoint_time = time.time()
     last_error_log = "-"
     update_counter = 0  # For anti_modify
+    resume_msg = None  # Dokumen resume_bot_N.txt, dikirim kalau done_tujuanN tidak muat di checkpoint
+    resume_saved_count = -1
 
     try:
         for chunk_start in range(start_id, end_id + 1, chunk_size):
@@ -263,6 +684,15 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                 break
 
             chunk_end = min(chunk_start + chunk_size - 1, end_id)
+            
+            # Resume: chunk yang sudah selesai di semua tujuan tidak perlu di-fetch lagi
+            if all(dst['done'].covers(chunk_start, chunk_end) for dst in dst_list):
+                count = chunk_end - chunk_start + 1
+                stats['success'] += count * num_dst
+                for i in range(num_dst):
+                    per_dst_stats[i]['success'] += count
+                continue
+            
             ids_to_fetch = list(range(chunk_start, chunk_end + 1))
             
             messages_batch = []
@@ -275,12 +705,17 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                     await asyncio.sleep(e.value + 5)
                 except Exception as e:
                     last_error_log = str(e)
-                    bot_logger.warning(f"⚠️ Fetch chunk {chunk_start}-{chunk_end} failed (retry {retry+1}): {e}")
+                    bot_logger.warning(
+                        f"⚠️ Fetch chunk {chunk_start}-{chunk_end} failed (retry {retry+1}): {e}",
+                        extra={**log_ctx, 'msg_id': chunk_start, 'error': type(e).__name__}
+                    )
                     if retry == fetch_retries - 1:
                         for _ in ids_to_fetch:
                             stats['failed'] += num_dst
                             for i in range(num_dst):
                                 per_dst_stats[i]['failed'] += 1
+                        for dst in dst_list:
+                            mark_ids(dst, 'failed', chunk_start, chunk_end)
                         continue
                     await asyncio.sleep(5)
 
@@ -304,20 +739,14 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                         stats['failed'] += num_dst
                         for i in range(num_dst):
                             per_dst_stats[i]['failed'] += 1
+                            mark_ids(dst_list[i], 'skipped', msg.id)
                         continue
                 
-                # Auto Batch Scaling
-                if auto_batch:
-                    cpu, _, _, _ = get_system_status()
-                    if cpu > 50:
-                        batch_time += 30  # Extra sleep if high load
-                    if num_dst > 3:
-                        batch_size = max(1, batch_size // 2)
-                
-                # BATCH SLEEP
+                # BATCH SLEEP (auto_batch: lama istirahat diskalakan governor)
                 if processed_count > 0 and processed_count % batch_size == 0:
-                    await status_msg.edit(f"😴 **SEDANG ISTIRAHAT BATCH ({batch_time}s)...**\n\n❄️ Mendinginkan Mesin...")
-                    await asyncio.sleep(batch_time)
+                    rest_time = int(governor.scale_rest(batch_time)) if auto_batch else batch_time
+                    await status_msg.edit(f"😴 **SEDANG ISTIRAHAT BATCH ({rest_time}s)...**\n\n❄️ Mendinginkan Mesin...")
+                    await asyncio.sleep(rest_time)
                     last_update_time = time.time()
 
                 # Cek Validitas
@@ -325,13 +754,21 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                     stats['failed'] += num_dst
                     for i in range(num_dst):
                         per_dst_stats[i]['failed'] += 1
+                        if msg:
+                            mark_ids(dst_list[i], 'skipped', msg.id)
                     continue
 
                 # Parallel Copy Tasks
                 copy_tasks = []
                 for idx, dst in enumerate(dst_list):
+                    if msg.id in dst['done']:
+                        per_dst_stats[idx]['success'] += 1
+                        stats['success'] += 1
+                        continue
+                    
                     if not dst['active']:
                         per_dst_stats[idx]['failed'] += 1
+                        mark_ids(dst, 'failed', msg.id)
                         continue
                     
                     # Filtering per dst
@@ -346,11 +783,13 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                     
                     if not should_copy:
                         per_dst_stats[idx]['failed'] += 1
+                        mark_ids(dst, 'skipped', msg.id)
                         continue
 
                     # Create copy task
-                    async def copy_to_dst(dst_info, msg_id):
+                    async def copy_to_dst(dst_info, msg_id, dst_idx):
                         for retry_idx in range(max_retries):
+                            attempt_start = time.perf_counter()
                             try:
                                 copy_params = {'chat_id': dst_info['chat']}
                                 if dst_info['topic']:
@@ -358,58 +797,74 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
 
                                 await msg.copy(**copy_params)
                                 
-                                per_dst_stats[idx]['success'] += 1
+                                per_dst_stats[dst_idx]['success'] += 1
                                 dst_info['last_success_id'] = msg_id
+                                mark_ids(dst_info, 'done', msg_id)
                                 
                                 return True
                             except FloodWait as e:
                                 nonlocal flood_count, delay_min
                                 flood_count += 1
-                                bot_logger.info(f"FloodWait for dst {idx}: Sleeping for {e.value} seconds")
+                                bot_logger.info(
+                                    f"FloodWait for dst {dst_idx}: Sleeping for {e.value} seconds",
+                                    extra={**log_ctx, 'dst': dst_idx, 'msg_id': msg_id, 'error': 'FloodWait',
+                                           'latency': round(time.perf_counter() - attempt_start, 3)}
+                                )
                                 await asyncio.sleep(e.value + 10)
                                 if dynamic_delay and flood_count > 3:
                                     delay_min *= 1.2  # Increase delay 20%
                                     flood_count = 0
                             except (PeerIdInvalid, ChannelInvalid, ChannelPrivate) as e:
-                                last_error_log = f"Peer Invalid for dst {idx}: {str(e)}"
-                                bot_logger.error(last_error_log)
+                                last_error_log = f"Peer Invalid for dst {dst_idx}: {str(e)}"
+                                err_ctx = {**log_ctx, 'dst': dst_idx, 'msg_id': msg_id, 'error': type(e).__name__}
+                                bot_logger.error(last_error_log, extra={**err_ctx, 'latency': round(time.perf_counter() - attempt_start, 3)})
                                 if time.time() - dst_info['refresh_cooldown'] > 300:
                                     try:
                                         await app.get_chat(dst_info['chat'])
                                         dst_info['refresh_cooldown'] = time.time()
-                                        bot_logger.info(f"Refreshed peer for dst {idx}")
+                                        bot_logger.info(f"Refreshed peer for dst {dst_idx}", extra=err_ctx)
                                     except Exception as refresh_e:
-                                        bot_logger.error(f"Refresh failed for dst {idx}: {refresh_e}")
+                                        bot_logger.error(f"Refresh failed for dst {dst_idx}: {refresh_e}", extra=err_ctx)
                                         dst_info['active'] = False
                                         return False
                             except RPCError as e:
-                                last_error_log = f"RPCError for dst {idx}: {str(e)}"
+                                last_error_log = f"RPCError for dst {dst_idx}: {str(e)}"
                                 if "500" in str(e) or "INTERDC" in str(e):
                                     await asyncio.sleep(10)
                                 else:
                                     await asyncio.sleep(5)
                             except Exception as e:
-                                last_error_log = f"Error for dst {idx}: {str(e)}"
+                                last_error_log = f"Error for dst {dst_idx}: {str(e)}"
                                 await asyncio.sleep(5)
                         
-                        per_dst_stats[idx]['failed'] += 1
+                        per_dst_stats[dst_idx]['failed'] += 1
+                        mark_ids(dst_info, 'failed', msg_id)
                         return False
 
-                    copy_tasks.append(copy_to_dst(dst, msg.id))
+                    copy_tasks.append(copy_to_dst(dst, msg.id, idx))
 
-                # Run parallel if multiple dst
+                # Run parallel if multiple dst (auto_batch: jumlah paralel dibatasi governor)
                 if copy_tasks:
+                    if auto_batch and len(copy_tasks) > 1:
+                        copy_sem = asyncio.Semaphore(governor.concurrency(len(copy_tasks)))
+                        
+                        async def limited(coro):
+                            async with copy_sem:
+                                return await coro
+                        
+                        copy_tasks = [limited(task) for task in copy_tasks]
                     results = await asyncio.gather(*copy_tasks, return_exceptions=True)
                     for res in results:
                         if isinstance(res, Exception):
-                            bot_logger.warning(f"Parallel copy exception: {res}")
+                            bot_logger.warning(f"Parallel copy exception: {res}", extra={**log_ctx, 'msg_id': msg.id, 'error': type(res).__name__})
                         elif res:
                             stats['success'] += 1
                             last_progress_time = time.time()
                         else:
                             stats['failed'] += 1
                     processed_count += len(copy_tasks)
-                    await asyncio.sleep(random.uniform(delay_min, delay_min + 0.5))
+                    rest_min = governor.scale_rest(delay_min) if auto_batch else delay_min
+                    await asyncio.sleep(random.uniform(rest_min, rest_min + 0.5))
 
                 # Idle Detection (built-in, always on)
                 if time.time() - last_progress_time > 300:  # 5 min no success
@@ -444,7 +899,12 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                     text += (
                         f"🌡️ **Resources:** CPU {cpu_val}% [{cpu_txt}] | RAM {ram_val:.2f} MB\n\n"
                         f"⚡ **Config:** Ember {chunk_size} | Jeda {delay_avg:.2f}s | {speed_txt}\n"
-                        f"Batch: {batch_time}s tiap {batch_size} file\n\n"
+                        f"Batch: {batch_time}s tiap {batch_size} file\n"
+                    )
+                    if auto_batch:
+                        text += f"🎛️ **Governor:** {governor.summary()}\n"
+                    text += (
+                        "\n"
                         f"🔄 Update tiap 10s | ⚠️ Last Error: {last_error_log}"
                     )
                     if anti_modify:
@@ -466,14 +926,27 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                     checkpoint_text = f"💾 AUTOSAVE: CHECKPOINT (BOT {bot_id}) ➖➖➖➖➖➖➖➖➖➖\n\n"
                     for idx, dst in enumerate(dst_list):
                         status = "Aktif ✅" if dst['active'] else "Non-Aktif ❌ (Error)"
-                        remaining_per_dst = (end_id - dst['last_success_id']) if dst['active'] else 0
+                        remaining_per_dst = remaining_ids(dst, start_id, end_id) if dst['active'] else 0
                         eta_per_dst = format_time(remaining_per_dst * delay_avg)
                         checkpoint_text += f"📌 Tujuan {idx+1} ({dst['chat']}): Last ID {dst['last_success_id']} | {status} | ETA: {eta_per_dst}\n"
+                        checkpoint_text += format_dst_ranges(dst, idx, ranges_budget(num_dst), bot_id)
+                    checkpoint_text = fit_text(checkpoint_text)
                     checkpoint_text += f"🕒 Saved: {saved_time}"
                     if anti_modify:
                         checkpoint_text += f" | #{update_counter}"
                         update_counter += 1
                     
+                    done_count = sum(len(dst['done']) for dst in dst_list)
+                    over_budget = any(
+                        dst['done'] and done_encoding(dst['done'], ranges_budget(num_dst)) is None for dst in dst_list
+                    )
+                    if over_budget and done_count != resume_saved_count:
+                        try:
+                            resume_msg = await save_resume_file(app, group_chat_id, dst_list, bot_id, resume_msg)
+                            resume_saved_count = done_count
+                        except Exception as e:
+                            bot_logger.warning(f"Gagal menyimpan file resume: {e}", extra={**log_ctx, 'error': type(e).__name__})
+                    
                     try:
                         await checkpoint_msg.edit(checkpoint_text)
                         last_checkpoint_time = time.time()
@@ -498,11 +971,18 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
         checkpoint_text = f"💾 AUTOSAVE: CHECKPOINT (BOT {bot_id}) ➖➖➖➖➖➖➖➖➖➖\n\n"
         for idx, dst in enumerate(dst_list):
             status = "Aktif ✅" if dst['active'] else "Non-Aktif ❌ (Error)"
-            remaining_per_dst = (end_id - dst['last_success_id']) if dst['active'] else 0
+            remaining_per_dst = remaining_ids(dst, start_id, end_id) if dst['active'] else 0
             eta_per_dst = format_time(remaining_per_dst * delay_avg)
             checkpoint_text += f"📌 Tujuan {idx+1} ({dst['chat']}): Last ID {dst['last_success_id']} | {status} | ETA: {eta_per_dst}\n"
+            checkpoint_text += format_dst_ranges(dst, idx, ranges_budget(num_dst), bot_id)
+        checkpoint_text = fit_text(checkpoint_text)
         checkpoint_text += f"🕒 Saved: {saved_time}"
         await checkpoint_msg.edit(checkpoint_text)
+        if any(dst['done'] and done_encoding(dst['done'], ranges_budget(num_dst)) is None for dst in dst_list):
+            try:
+                resume_msg = await save_resume_file(app, group_chat_id, dst_list, bot_id, resume_msg)
+            except Exception as e:
+                bot_logger.warning(f"Gagal menyimpan file resume: {e}", extra={**log_ctx, 'error': type(e).__name__})
 
         # Export Stats to File if enabled
         if export_stats_flag:
@@ -511,6 +991,13 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
                 'success': stats['success'],
                 'failed': stats['failed'],
                 'per_dst': per_dst_stats,
+                'ranges': {
+                    idx + 1: {
+                        'done': dst['done'].dumps(),
+                        'failed': dst['failed'].dumps(),
+                        'skipped': dst['skipped'].dumps()
+                    } for idx, dst in enumerate(dst_list)
+                },
                 'last_error': last_error_log
             }
             stats_json = json.dumps(stats_data, indent=4)
@@ -519,18 +1006,23 @@ async def copy_worker(job: Dict, status_msg, checkpoint_msg, bot_id: int, app: C
             await app.send_document(group_chat_id, stats_file, caption=f"📊 Stats Akhir Bot {bot_id}")
 
     except Exception as e:
-        bot_logger.error(f"❌ CRASH IN WORKER: {e}")
+        bot_logger.error(f"❌ CRASH IN WORKER: {e}", extra={**log_ctx, 'error': type(e).__name__})
         await status_msg.edit(f"❌ **CRASH SYSTEM:** {e}")
         if error_notify and admin_chat:
             await app.send_message(admin_chat, f"❌ CRASH in Bot {bot_id}: {e}")
+        # Simpan progress persis supaya job bisa di-resume setelah crash
+        if any(dst['done'] for dst in dst_list):
+            try:
+                await save_resume_file(app, group_chat_id, dst_list, bot_id, resume_msg)
+            except Exception as resume_e:
+                bot_logger.error(f"Gagal menyimpan file resume: {resume_e}", extra={**log_ctx, 'error': type(resume_e).__name__})
     finally:
         bot_data[bot_id]['is_working'] = False
 
 # --- COMMANDS (DINAMIS & ROBUST) ---
 def register_handlers(app: Client, bot_id: int):
     bot_logger = logging.getLogger(f"{__name__}.bot{bot_id}")
-    bot_logger.handlers = logger.handlers
-    bot_logger.setLevel(logger.level)
+    bot_logger.addFilter(BotContextFilter(bot_id))
 
     if bot_id == 1:
         start_commands = ["start", "start1"]
@@ -548,7 +1040,14 @@ def register_handlers(app: Client, bot_id: int):
             return await message.reply(f"⚠️ **Bot {bot_id} Sedang Sibuk!** Gunakan `/{stop_commands[-1]}` dulu.")
         
         try:
-            config = parse_config(message.text)
+            command_text = message.text
+            # Resume dari file resume_bot_N.txt: perintah start dikirim sebagai reply ke file itu
+            reply = message.reply_to_message
+            if reply and reply.document and (reply.document.file_name or "").startswith("resume_bot_"):
+                resume_data = await client.download_media(reply, in_memory=True)
+                command_text += "\n" + bytes(resume_data.getbuffer()).decode()
+            
+            config = parse_config(command_text)
             valid, error = validate_config(config)
             if not valid:
                 return await message.reply(f"❌ **Config Gagal:** {error}\nCoba cek format perintah.")
@@ -571,7 +1070,11 @@ def register_handlers(app: Client, bot_id: int):
                     'filter': config['dst_filters'][len(dst_list) - 1],
                     'last_success_id': start_id - 1,
                     'active': True,
-                    'refresh_cooldown': 0
+                    'refresh_cooldown': 0,
+                    'done': config['dst_done'][len(dst_list)],
+                    'failed': RangeSet(),
+                    'skipped': RangeSet(),
+                    'handled': clip_ranges(config['dst_done'][len(dst_list)], start_id, end_id)
                 })
 
             status_msg = await message.reply(f"🔍 **Verifikasi Akses Channel (Bot {bot_id})...**")
@@ -597,12 +1100,16 @@ def register_handlers(app: Client, bot_id: int):
             checkpoint_text = f"💾 AUTOSAVE: CHECKPOINT (BOT {bot_id}) ➖➖➖➖➖➖➖➖➖➖\n\n"
             for idx, dst in enumerate(dst_list):
                 status = "Aktif ✅" if dst['active'] else "Non-Aktif ❌ (Error)"
-                eta_per_dst = format_time((end_id - start_id + 1) * config['delay_min'])
+                eta_per_dst = format_time(remaining_ids(dst, start_id, end_id) * config['delay_min'])
                 checkpoint_text += f"📌 Tujuan {idx+1} ({dst['chat']}): Last ID {dst['last_success_id']} | {status} | ETA: {eta_per_dst}\n"
+                if dst['done']:
+                    checkpoint_text += format_dst_ranges(dst, idx, ranges_budget(len(dst_list)), bot_id)
+            checkpoint_text = fit_text(checkpoint_text)
             checkpoint_text += f"🕒 Saved: {initial_saved_time}"
             checkpoint_msg = await message.reply(checkpoint_text)
 
             job = {
+                'job_id': f"bot{bot_id}-{status_msg.id}",
                 'src_chat': src_chat, 
                 'start_id': start_id, 
                 'end_id': end_id,
@@ -624,7 +1131,7 @@ def register_handlers(app: Client, bot_id: int):
                 'anti_modify': config['anti_modify']
             }
             
-            asyncio.create_task(copy_worker(job, status_msg, checkpoint_msg, bot_id, client, bot_logger, group_chat_id))
+            asyncio.create_task(copy_worker(job, status_msg, checkpoint_msg, bot_id, client, bot_logger, group_chat_id), name=f"copy_worker_bot{bot_id}")
             
         except Exception as e:
             bot_logger.error(f"❌ Error in start_cmd: {e}")
@@ -648,6 +1155,8 @@ def register_handlers(app: Client, bot_id: int):
             f"🤖 **Status:** {status_bot}\n"
             f"🧠 **CPU:** {cpu_val}% [{cpu_txt}]\n"
             f"💾 **RAM:** {ram_val:.2f} MB\n"
+            f"⏱️ **Loop Lag:** {loop_stats['lag_ms']:.1f} ms (max {loop_stats['max_lag_ms']:.1f} ms)\n"
+            f"🎛️ **Governor:** {governor.summary()}\n"
             f"──────────────────"
         )
         await message.reply(text)
@@ -681,9 +1190,10 @@ date_from: 2023-01-01  # Filter msg dari tanggal ini (selective copy)
 date_to: 2023-12-31  # Filter msg sampai tanggal ini
 keyword: kata_kunci  # Filter msg yang mengandung keyword
 mode: aggressive  # Mode aggressive (retry rendah, default: off/safe)
-auto_batch: on  # Auto scaling batch size (default: off)
+auto_batch: on  # Paralel & istirahat diatur governor beban server (default: off)
 export_stats: on  # Export stats ke file JSON di akhir (default: on)
 anti_modify: on  # Handle MESSAGE_NOT_MODIFIED (default: on)
+done_tujuan1: 25000-25010,25012  # Resume: ID yang sudah sukses (salin dari checkpoint, atau reply file resume_bot_N.txt)
 """
         await message.reply(panduan_text)
 
@@ -721,6 +1231,80 @@ if not clients:
     logger.error("No bots initialized. Exiting.")
     sys.exit(1)
 
+# --- DIAGNOSTIK: LOOP LAG & DEBUG ROUTES ---
+async def loop_lag_monitor():
+    # Ukur keterlambatan wake-up sleep: selisihnya = waktu loop diblokir callback lain.
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag_ms = max(0.0, (time.perf_counter() - start - LOOP_LAG_INTERVAL) * 1000)
+        loop_stats['lag_ms'] = lag_ms
+        loop_stats['max_lag_ms'] = max(loop_stats['max_lag_ms'], lag_ms)
+        loop_stats['window_max_ms'] = max(loop_stats['window_max_ms'], lag_ms)  # Di-reset governor
+        loop_stats['samples'] += 1
+        if lag_ms > 500:
+            logger.warning(
+                f"⏱️ Event loop lag tinggi: {lag_ms:.0f} ms",
+                extra={'error': 'LoopLag', 'latency': round(lag_ms / 1000, 3)}
+            )
+
+async def flush_log_duplicates():
+    while True:
+        await asyncio.sleep(max(LOG_DEDUP_WINDOW, 1.0))
+        for record in dedup_filter.flush():
+            queue_handler.handle(record)
+
+def check_debug_token(request) -> bool:
+    # Hanya dari header: query string ikut tercatat di access log aiohttp
+    token = request.headers.get("X-Debug-Token", "")
+    return hmac.compare_digest(token.encode(), DEBUG_TOKEN.encode())
+
+profile_lock = asyncio.Lock()
+
+async def debug_profile_handler(request):
+    if not check_debug_token(request):
+        return web.Response(status=403, text="Forbidden")
+    try:
+        seconds = min(int(request.query.get("seconds", 10)), MAX_PROFILE_SECONDS)
+        limit = int(request.query.get("limit", 50))
+    except ValueError:
+        return web.Response(status=400, text="seconds/limit harus angka")
+    if seconds <= 0 or limit <= 0:
+        return web.Response(status=400, text="seconds/limit harus positif")
+    sort_key = request.query.get("sort", "cumulative")
+    if sort_key not in ("cumulative", "tottime", "ncalls"):
+        return web.Response(status=400, text="sort: cumulative, tottime, ncalls")
+    if profile_lock.locked():
+        return web.Response(status=409, text="Profiling lain sedang berjalan")
+
+    async with profile_lock:
+        # Semua coroutine jalan di thread loop ini, jadi profiler menangkap copy_worker juga.
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort_key).print_stats(limit)
+    return web.Response(text=f"# Profile {seconds}s (sort={sort_key})\n{out.getvalue()}")
+
+async def debug_tasks_handler(request):
+    if not check_debug_token(request):
+        return web.Response(status=403, text="Forbidden")
+    out = io.StringIO()
+    tasks = asyncio.all_tasks()
+    out.write(
+        f"# {len(tasks)} tasks | loop lag {loop_stats['lag_ms']:.1f} ms "
+        f"(max {loop_stats['max_lag_ms']:.1f} ms, {loop_stats['samples']} sampel)\n\n"
+    )
+    for task in tasks:
+        out.write(f"== {task.get_name()}: {task.get_coro()!r}\n")
+        task.print_stack(file=out)
+        out.write("\n")
+    return web.Response(text=out.getvalue())
+
 # --- WEB SERVER ---
 async def web_handler(request):
     return web.Response(text="Multi-Bot Running V9.6 (Enhanced Features).")
@@ -728,12 +1312,28 @@ async def web_handler(request):
 async def start_web():
     app_web = web.Application()
     app_web.add_routes([web.get('/', web_handler)])
+    if DEBUG_TOKEN:
+        app_web.add_routes([
+            web.get('/debug/profile', debug_profile_handler),
+            web.get('/debug/tasks', debug_tasks_handler),
+        ])
+        logger.info("Debug routes aktif: /debug/profile, /debug/tasks")
     runner = web.AppRunner(app_web)
     await runner.setup()
     site = web.TCPSite(runner, "0.0.0.0", PORT)
     await site.start()
 
 async def main():
+    loop = asyncio.get_running_loop()
+    if SLOW_CALLBACK_MS > 0:
+        # Debug mode asyncio melog callback yang memblokir loop lebih lama dari threshold.
+        loop.slow_callback_duration = SLOW_CALLBACK_MS / 1000
+        loop.set_debug(True)
+        logging.getLogger("asyncio").setLevel(logging.WARNING)
+    asyncio.create_task(loop_lag_monitor(), name="loop_lag_monitor")
+    if LOG_DEDUP_WINDOW > 0:
+        asyncio.create_task(flush_log_duplicates(), name="log_dedup_flush")
+    asyncio.create_task(governor.run(), name="load_governor")
     await start_web()
     logger.info("🤖 Starting Telegram Bots...")
     for client in clients: